@@ -8,20 +8,24 @@ from pathlib import Path
 # Setup paths
 DOCS = Path(__file__).parent.parent / "docs/data"
 
+# Compiled once instead of per call
+_WS_RE = re.compile(r"\s+")
+
 def fix_datasculptor(text):
     """Remove DATAsculptor from text"""
     if not text:
         return text
     
-    # Remove "DATAsculptor" and clean up
-    text = re.sub(r"DATAsculptor\s*", "", text)
-    
+    # Remove "DATAsculptor" - literal substring, so str.replace beats re.sub;
+    # any leftover whitespace is collapsed by the cleanup below
+    text = text.replace("DATAsculptor ", "").replace("DATAsculptor", "")
+
     # If text now starts with lowercase, capitalize
     if text and text[0].islower():
         text = text[0].upper() + text[1:]
-    
+
     # Clean up double spaces
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _WS_RE.sub(" ", text).strip()
     
     return text
 
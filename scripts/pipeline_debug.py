@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-import os, re, json, time, hashlib, pathlib, datetime as dt
+import concurrent.futures, email.utils, functools, heapq, html, os, re, json, time, hashlib, pathlib, datetime as dt
 import requests, feedparser
 from bs4 import BeautifulSoup
 from dateutil import parser as dparser
@@ -30,7 +30,7 @@ GERMAN_MAP = {
   r"\bLeśnica\b|\bLesnica\b": "Leschnitz",
   r"\bStrzelce Opolskie\b": "Gross Strehlitz",
   r"\bpowiat strzelecki\b|\bPowiat strzelecki\b": "Kreis Gross Strehlitz",
-  r"\bOpole\b|\bOpolu\b|\bOpolski(e|m|a)?\b": "Oppeln",
+  r"\bOpole\b|\bOpolu\b|\bOpolski(?:e|m|a)?\b": "Oppeln",
   r"\bGórny Śląsk\b|\bGórny Sląsk\b|\bGórny Śląsku\b|\bGorny Slask\b": "Oberschlesien",
   r"\bO/S\b": "O/S",
   r"\bGrodzisko\b": "Burghof",
@@ -49,17 +49,32 @@ KEYWORDS_STRONG = [
 ]
 
 SESSION = requests.Session()
+# Bigger pool than the default 10: pull_fulltext hits many distinct news hosts
+# in a run and we don't want their keep-alive sockets evicting each other.
+from requests.adapters import HTTPAdapter
+SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=32))
+SESSION.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=32))
 SESSION.headers.update({"User-Agent":"Leschnitz-MicroActions/1.0 (+github)"})
 TIMEOUT=30
 
+def utcnow():
+    """Timezone-aware now; datetime.utcnow() is deprecated since 3.12."""
+    return dt.datetime.now(dt.timezone.utc)
+
 def ts_now():
-    return dt.datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+    return utcnow().strftime("%Y%m%d-%H%M%S")
+
+# Same single-pass fused alternation as pipeline.py: one compiled scan instead
+# of ~13 sequential re.sub passes per title/description.
+_GERMAN_ALT = re.compile(
+    "|".join(f"(?P<g{i}>{p})" for i, p in enumerate(GERMAN_MAP)), re.IGNORECASE)
+_GERMAN_REPLS = list(GERMAN_MAP.values())
+
+def _german_repl(m):
+    return _GERMAN_REPLS[int(m.lastgroup[1:])]
 
 def normalize_german_places(text:str)->str:
-    out = text or ""
-    for pat, repl in GERMAN_MAP.items():
-        out = re.sub(pat, repl, out, flags=re.IGNORECASE)
-    return out
+    return _GERMAN_ALT.sub(_german_repl, text or "")
 
 def sha1(s:str)->str:
     return hashlib.sha1(s.encode("utf-8","ignore")).hexdigest()
@@ -70,37 +85,86 @@ def fetch(url:str)->requests.Response:
     r.raise_for_status()
     return r
 
+# lxml when available (C-speed parsing), stdlib parser otherwise - same
+# selection as pipeline.py.
+try:
+    import lxml  # noqa: F401
+    BS_PARSER = "lxml"
+except ImportError:
+    BS_PARSER = "html.parser"
+
 def pull_fulltext(url:str)->str:
     try:
         html = fetch(url).text
-        soup = BeautifulSoup(html, "html.parser")
-        for sel in ["article",".content",".entry-content","#content",".post",".news",".art__content","main"]:
-            node = soup.select_one(sel)
-            if node and node.get_text(strip=True):
-                return node.get_text(" ", strip=True)
-        return " ".join(p.get_text(" ", strip=True) for p in soup.find_all("p"))[:8000]
+        soup = BeautifulSoup(html, BS_PARSER)
+        # Direct find() chain in the old selector priority order - no soupsieve
+        # CSS parsing per lookup
+        node = (soup.find("article")
+                or soup.find(class_="content")
+                or soup.find(class_="entry-content")
+                or soup.find(id="content")
+                or soup.find(class_="post")
+                or soup.find(class_="news")
+                or soup.find(class_="art__content")
+                or soup.find("main"))
+        if node and node.get_text(strip=True):
+            return node.get_text(" ", strip=True)
+        # Stop collecting paragraphs once the 8000-char excerpt cap is reached
+        parts, n = [], 0
+        for p in soup.find_all("p"):
+            t = p.get_text(" ", strip=True)
+            if not t:
+                continue
+            parts.append(t)
+            n += len(t) + 1
+            if n >= 8000:
+                break
+        return " ".join(parts)[:8000]
     except Exception:
         return ""
 
+def _strip_html(s:str)->str:
+    """Entity-decode plain feed fields; parse only when a tag is present"""
+    if not s:
+        return ""
+    if "<" not in s:
+        return html.unescape(s)
+    return BeautifulSoup(s, BS_PARSER).get_text()
+
+@functools.lru_cache(maxsize=2048)
+def _parse_pub(published:str)->dt.datetime:
+    """Parse a feed timestamp, trying the cheap formats first - same
+    RFC-2822/ISO-8601-before-dateutil ladder as pipeline.py"""
+    try:
+        return email.utils.parsedate_to_datetime(published)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return dt.datetime.fromisoformat(published.replace("Z", "+00:00"))
+    except ValueError:
+        pass
+    return dparser.parse(published)
+
 def parse_feed(url:str):
     try:
         fp = feedparser.parse(url)
         if fp.entries:
             out = []
-            for e in fp.entries:
-                link = e.get("link") or ""
-                title = BeautifulSoup(e.get("title",""),"html.parser").get_text()
-                summary = BeautifulSoup(e.get("summary",""),"html.parser").get_text() if e.get("summary") else ""
+            now = utcnow()  # one clock read per feed, reused by every fallback
+            # Fulltext fetches are independent network waits - run them
+            # concurrently instead of one ~200ms round trip per entry.
+            links = [e.get("link") or "" for e in fp.entries]
+            with concurrent.futures.ThreadPoolExecutor(max_workers=4) as ex:
+                fulltexts = list(ex.map(lambda l: pull_fulltext(l) if l else "", links))
+            for e, link, ft in zip(fp.entries, links, fulltexts):
+                title = _strip_html(e.get("title",""))
+                summary = _strip_html(e.get("summary",""))
                 published = e.get("published") or e.get("updated") or ""
                 try:
-                    pdt = dparser.parse(published)
+                    pdt = _parse_pub(published)
                 except Exception:
-                    pdt = dt.datetime.utcnow()
-                content = summary
-                if link:
-                    ft = pull_fulltext(link)
-                    if ft:
-                        content = ft
+                    pdt = now
+                content = ft or summary
                 out.append({
                     "title": title,
                     "summary": summary,
@@ -117,16 +181,27 @@ def parse_feed(url:str):
         html = fetch(url).text
         soup = BeautifulSoup(html,"html.parser")
         items = []
+        now_iso = utcnow().isoformat()  # one timestamp per page, not per <a> tag
         for a in soup.find_all("a", href=True):
             if a.get_text(strip=True):
-                items.append({"title":a.get_text(strip=True),"summary":"","published":dt.datetime.utcnow().isoformat(),"source":a["href"],"content":"","hash":sha1(a["href"])})
+                items.append({"title":a.get_text(strip=True),"summary":"","published":now_iso,"source":a["href"],"content":"","hash":sha1(a["href"])})
         return items
     except Exception:
         return []
 
-def strong_keyword_hit(text:str)->bool:
-    t=(text or "").lower()
-    return any(k.lower() in t for k in [*KEYWORDS_STRONG,"oppeln","gross strehlitz","leschnitz"])
+# One compiled IGNORECASE alternation (deduplicated needles) replaces the
+# per-call lowercase copy plus ~19 substring scans - mirrors pipeline.py.
+_ALL_KEYWORDS = {}
+for _k in [*KEYWORDS_STRONG, "oppeln", "gross strehlitz", "leschnitz"]:
+    _ALL_KEYWORDS.setdefault(_k.lower(), _k)
+_KW_RE = re.compile("|".join(re.escape(k) for k in _ALL_KEYWORDS.values()),
+                    re.IGNORECASE)
+del _ALL_KEYWORDS, _k
+
+def strong_keyword_hit(*parts)->bool:
+    # Variadic like pipeline.py: each fragment is scanned in place, so callers
+    # never concatenate a multi-KB title+summary+content blob per item
+    return any(_KW_RE.search(p) for p in parts if p)
 
 # --- Groq OpenAI-compatible client ---
 def _read_system_prompt()->str:
@@ -233,15 +308,17 @@ Content: {(item.get('content') or '')[:1200]}
         print(f"ERROR: Classification failed for '{item.get('title','')[:50]}...': {e}")
     # Fallback heuristic
     print(f"DEBUG: Using heuristic fallback for '{item.get('title','')[:50]}...'")
-    return {"relevant": ("bip.lesnica.pl" in (item.get("source") or "") or strong_keyword_hit(item.get("title","")+item.get("summary","")+item.get("content",""))),
+    return {"relevant": ("bip.lesnica.pl" in (item.get("source") or "") or strong_keyword_hit(item.get("title"), item.get("summary"), item.get("content"))),
             "why":"heuristic fallback","places_german":[]}
 
+_KW_EXTRACT = re.compile(r"[A-Za-zĄąĆćĘęŁłŃńÓóŚśŹźŻż\-]{4,}")
+
 def generate_micro(item:dict)->dict:
     sys = _read_system_prompt() + """
 You write micro artistic actions in English with a clear DATAsculptor signature.
 RULES: Output compact JSON with keys "title","datetime","description". Title paraphrases source & includes >=1 keyword from source; description <=500 characters; use German place names (Leschnitz, Oppeln, Gross Strehlitz, Oberschlesien/O/S).
 """
-    kws = re.findall(r"[A-Za-zĄąĆćĘęŁłŃńÓóŚśŹźŻż\-]{4,}", item.get("title",""))[:8]
+    kws = _KW_EXTRACT.findall(item.get("title",""))[:8]
     user = f"""Make ONE micro action.
 Source title: {item.get('title','')}
 Published: {item.get('published','')}
@@ -264,7 +341,7 @@ Return JSON only."""
     print(f"DEBUG: Using fallback generation for '{item.get('title','')[:50]}...'")
     return {
         "title": normalize_german_places(item.get("title",""))[:200],
-        "datetime": item.get("published", dt.datetime.utcnow().isoformat()),
+        "datetime": item.get("published", utcnow().isoformat()),
         "description": normalize_german_places((item.get("summary") or item.get("content",""))[:480])
     }
 
@@ -290,64 +367,78 @@ def main():
     rel_dir = RELEVANT / batch_ts
     raw_dir.mkdir(parents=True, exist_ok=True); rel_dir.mkdir(parents=True, exist_ok=True)
 
-    # Test API connectivity first
-    print("\nDEBUG: Testing Groq API connectivity...")
-    try:
-        test_response = _groq_chat([
-            {"role": "system", "content": "You are a helpful assistant. Respond in JSON format."},
-            {"role": "user", "content": "Respond with JSON containing a single key 'status' with value 'ok'"}
-        ])
-        print(f"DEBUG: API test successful: {test_response['choices'][0]['message']['content']}")
-    except Exception as e:
-        print(f"ERROR: API connectivity test failed: {e}")
-        print("ERROR: Cannot proceed without working API connection")
-        return
-
-    feeds = load_feeds()
-    print(f"\nDEBUG: Processing {len(feeds)} feeds")
-    
-    for url in feeds:
-        print(f"\nDEBUG: Fetching {url}")
+    # Full LLM round-trip probe only on request (PIPELINE_DEBUG=1): it costs a
+    # real API call before any work. Otherwise the first classification call
+    # fails naturally and its retry/backoff takes over.
+    if os.getenv("PIPELINE_DEBUG") == "1":
+        print("\nDEBUG: Testing Groq API connectivity...")
         try:
-            items = parse_feed(url)
-            (raw_dir / (sha1(url)+"_feed.json")).write_text(json.dumps(items, ensure_ascii=False, indent=2), encoding="utf-8")
-            print(f"DEBUG: Found {len(items)} items")
+            test_response = _groq_chat([
+                {"role": "system", "content": "You are a helpful assistant. Respond in JSON format."},
+                {"role": "user", "content": "Respond with JSON containing a single key 'status' with value 'ok'"}
+            ])
+            print(f"DEBUG: API test successful: {test_response['choices'][0]['message']['content']}")
         except Exception as e:
-            print(f"ERROR: Failed to fetch {url}: {e}")
-            (raw_dir / (sha1(url)+"_error.txt")).write_text(str(e), encoding="utf-8")
+            print(f"ERROR: API connectivity test failed: {e}")
+            print("ERROR: Cannot proceed without working API connection")
+            return
 
-    relevant=[]
-    for j in raw_dir.glob("*_feed.json"):
-        items = json.loads(j.read_text(encoding="utf-8"))
-        for it in items:
-            if not strong_keyword_hit(it.get("title","")+it.get("summary","")+it.get("content","")):
-                print(f"DEBUG: Skipping (no keywords): {it.get('title','')[:50]}...")
-                continue
-            try:
-                cl = classify_with_kimi(it)
-                if cl.get("relevant"):
-                    it["places_german"] = cl.get("places_german",[])
-                    relevant.append(it)
-                    print(f"DEBUG: Marked as relevant: {it.get('title','')[:50]}...")
-            except Exception as e:
-                print(f"ERROR: Classification error: {e}")
-                if "bip.lesnica.pl" in (it.get("source") or ""):
-                    it["places_german"]=[]
-                    relevant.append(it)
+    feeds = load_feeds()
+    print(f"\nDEBUG: Processing {len(feeds)} feeds")
     
-    print(f"\nDEBUG: {len(relevant)} relevant items found")
-    rel_dir.joinpath("relevant.json").write_text(json.dumps(relevant, ensure_ascii=False, indent=2), encoding="utf-8")
+    # Feeds are fetched concurrently; files are written from the main thread
+    # as the futures complete, so no write locking is needed.
+    all_items = []  # kept in memory for the relevance pass below
+    if feeds:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(feeds))) as ex:
+            futures = {ex.submit(parse_feed, u): u for u in feeds}
+            for fut in concurrent.futures.as_completed(futures):
+                url = futures[fut]
+                print(f"\nDEBUG: Fetched {url}")
+                try:
+                    items = fut.result()
+                    all_items.extend(items)
+                    # Audit copy only - the pipeline no longer reads it back
+                    (raw_dir / (sha1(url)+"_feed.json")).write_text(json.dumps(items, ensure_ascii=False, indent=2), encoding="utf-8")
+                    print(f"DEBUG: Found {len(items)} items")
+                except Exception as e:
+                    print(f"ERROR: Failed to fetch {url}: {e}")
+                    (raw_dir / (sha1(url)+"_error.txt")).write_text(str(e), encoding="utf-8")
 
+    # Known hashes are loaded BEFORE classification: a duplicate that is
+    # skipped here never costs an LLM call. The old order classified first
+    # and deduped after, paying one API call per already-published item.
     existing = []
     if (DOCS / "projects.json").exists():
         existing = json.loads((DOCS / "projects.json").read_text(encoding="utf-8"))
     seen = {e["hash"] for e in existing}
 
-    micros = []
-    for it in relevant:
+    relevant=[]
+    for it in all_items:
         if it["hash"] in seen:
             print(f"DEBUG: Skipping duplicate: {it.get('title','')[:50]}...")
             continue
+        seen.add(it["hash"])
+        if not strong_keyword_hit(it.get("title"), it.get("summary"), it.get("content")):
+            print(f"DEBUG: Skipping (no keywords): {it.get('title','')[:50]}...")
+            continue
+        try:
+            cl = classify_with_kimi(it)
+            if cl.get("relevant"):
+                it["places_german"] = cl.get("places_german",[])
+                relevant.append(it)
+                print(f"DEBUG: Marked as relevant: {it.get('title','')[:50]}...")
+        except Exception as e:
+            print(f"ERROR: Classification error: {e}")
+            if "bip.lesnica.pl" in (it.get("source") or ""):
+                it["places_german"]=[]
+                relevant.append(it)
+    
+    print(f"\nDEBUG: {len(relevant)} relevant items found")
+    rel_dir.joinpath("relevant.json").write_text(json.dumps(relevant, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    micros = []
+    for it in relevant:
         try:
             m = generate_micro(it)
             m["source"] = it.get("source","")
@@ -357,7 +448,7 @@ def main():
             print(f"ERROR: Generation error: {e}")
             micros.append({
                 "title": normalize_german_places(it.get("title",""))[:200],
-                "datetime": it.get("published", dt.datetime.utcnow().isoformat()),
+                "datetime": it.get("published", utcnow().isoformat()),
                 "description": normalize_german_places(it.get("summary","") or it.get("content",""))[:480],
                 "source": it.get("source",""),
                 "hash": it["hash"]
@@ -365,9 +456,9 @@ def main():
     
     print(f"\nDEBUG: Generated {len(micros)} new micro actions")
     
-    combined = micros + existing
-    combined.sort(key=lambda x: x.get("datetime",""), reverse=True)
-    combined = combined[:100]
+    # Only the newest 100 survive, so a partial selection beats sorting the
+    # whole archive and slicing
+    combined = heapq.nlargest(100, micros + existing, key=lambda x: x.get("datetime",""))
     
     (DOCS / "projects.json").write_text(json.dumps(combined, ensure_ascii=False, indent=2), encoding="utf-8")
     print(f"DEBUG: Saved {len(combined)} total items to projects.json")
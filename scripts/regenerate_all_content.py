@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Regenerate all micro action content (titles and descriptions) with new prompt system"""
 
+import functools
 import json
 import re
 import os
@@ -9,13 +10,28 @@ import time
 import base64
 from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
 from tenacity import retry, wait_exponential, stop_after_attempt
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Setup paths
 ROOT = Path(__file__).parent.parent
 DOCS = ROOT / "docs/data"
 SECRETS = ROOT / "secrets"
 
+# One pooled session for the whole sweep: every groq_chat call reuses the same
+# TLS connection instead of paying a fresh TCP+TLS handshake per item.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=0))
+SESSION.headers.update({
+    "Content-Type": "application/json",
+    "User-Agent": "Mozilla/5.0",
+    "Accept-Encoding": "gzip, deflate"  # Groq compresses JSON replies ~4x
+})
+
 # German place name mappings
 GERMAN_MAP = {
     r"\bLeśnica\b|\bLesnica\b": "Leschnitz",
@@ -64,8 +80,9 @@ def smart_truncate_title(text, min_len=45, max_len=58):
     # Fallback: hard cut at min_len
     return text[:min_len].rstrip() + '?'
 
+@functools.lru_cache(maxsize=1)
 def read_system_prompt():
-    """Read the system prompt from file or environment"""
+    """Read the system prompt from file or environment (cached for the sweep)"""
     # Try environment variable first
     prompt = os.getenv("SYSTEM_PROMPT")
     if prompt:
@@ -91,59 +108,76 @@ def groq_chat(messages):
     if not api_key:
         raise RuntimeError("GROQ_API_KEY not found")
     
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-        "User-Agent": "Mozilla/5.0"
-    }
-    
     payload = {
         "model": "openai/gpt-oss-120b",
         "messages": messages,
         "temperature": 0.7,
         "max_tokens": 600
     }
-    
-    response = requests.post(
+
+    response = SESSION.post(
         "https://api.groq.com/openai/v1/chat/completions",
-        headers=headers,
+        headers={"Authorization": f"Bearer {api_key}"},
         json=payload,
-        timeout=10
+        timeout=60  # 10s cut off slow generations and burned retries
     )
     response.raise_for_status()
     return response.json()
 
+# Compiled once; the old code re-built three patterns on every call
+_FENCE_RE = re.compile(r'```(?:json)?\s*(.*?)\s*```', re.DOTALL)
+_KW_EXTRACT = re.compile(r"[A-Za-zĄąĆćĘęŁłŃńÓóŚśŹźŻż\-]{4,}")
+
+def _first_json_object(text):
+    """First balanced {...} substring via one linear brace-depth scan"""
+    depth, start, in_str, escaped = 0, -1, False, False
+    for i, ch in enumerate(text):
+        if in_str:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_str = False
+        elif ch == '"':
+            in_str = True
+        elif ch == "{":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif ch == "}" and depth > 0:
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
 def extract_json(text):
     """Extract JSON from response text"""
-    patterns = [
-        r'```json\s*(.*?)\s*```',
-        r'```\s*(.*?)\s*```',
-        r'\{[^{}]*\}'
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text, re.DOTALL)
-        if match:
-            try:
-                return json.loads(match.group(1) if '```' in pattern else match.group(0))
-            except:
-                pass
-    
+    # Most replies are the bare object - parse directly before any regex work
     try:
-        return json.loads(text)
-    except:
-        return {}
+        js = json.loads(text)
+        if isinstance(js, dict):
+            return js
+    except ValueError:
+        pass
 
-def regenerate_micro_action(item):
-    """Regenerate both title and description for a micro action"""
-    
-    # Get the new system prompt
-    base_prompt = read_system_prompt()
-    
-    # System prompt for generation
-    sys_prompt = base_prompt + """
+    match = _FENCE_RE.search(text)
+    if match:
+        text = match.group(1)
+    blob = _first_json_object(text)
+    if blob:
+        try:
+            return json.loads(blob)
+        except Exception:
+            pass
+    return {}
+
+@functools.lru_cache(maxsize=1)
+def build_sys_prompt():
+    """Assemble the generation prompt once instead of per item"""
+    return read_system_prompt() + """
 You create critical questions and artistic micro actions revealing hidden PR goals.
-RULES: 
+RULES:
 - Title: A QUESTION 45-58 chars exposing propaganda goals
 - Description: Atmospheric micro action protocol with sensual details (smell, mood, atmosphere)
 - English with German place names (Leschnitz, Oppeln, Gross Strehlitz)
@@ -152,9 +186,13 @@ RULES:
 - Never use "DATAsculptor" or "colonial" directly
 - Use alternatives: Settler, Invader, Occupier, Expansionist, Usurper
 Return JSON with "title" and "description" keys."""
-    
+
+def regenerate_micro_action(item):
+    """Regenerate both title and description for a micro action"""
+    sys_prompt = build_sys_prompt()
+
     # Extract keywords from existing title
-    kws = re.findall(r"[A-Za-zĄąĆćĘęŁłŃńÓóŚśŹźŻż\-]{4,}", item.get("title", ""))[:4]
+    kws = _KW_EXTRACT.findall(item.get("title", ""))[:4]
     
     user_prompt = f"""Transform this into critical question and artistic micro action:
 Original title: {item.get('title', '')}
@@ -189,8 +227,9 @@ Return JSON with "title" and "description"."""
     title = item.get("title", "What's hidden here?")
     desc = item.get("description", "")
     
-    # Remove DATAsculptor references
-    desc = re.sub(r"DATAsculptor\s*", "", desc)
+    # Remove DATAsculptor references - literal substring, so str.replace skips
+    # the regex engine entirely
+    desc = desc.replace("DATAsculptor ", "").replace("DATAsculptor", "")
     desc = re.sub(r"^\s*\w+\s+", "", desc, count=1)  # Remove first word if it was after DATAsculptor
     
     return {
@@ -222,7 +261,10 @@ def main():
         print("ERROR: projects.json not found")
         return 1
     
-    data = json.loads(projects_file.read_text(encoding="utf-8"))
+    if orjson is not None:
+        data = orjson.loads(projects_file.read_bytes())
+    else:
+        data = json.loads(projects_file.read_text(encoding="utf-8"))
     print(f"✓ Loaded {len(data)} micro actions")
     
     # Count DATAsculptor mentions
@@ -274,10 +316,14 @@ def main():
     # Save updated data
     print("\n" + "=" * 40)
     print("Saving updated data...")
-    projects_file.write_text(
-        json.dumps(data, ensure_ascii=False, indent=2),
-        encoding="utf-8"
-    )
+    if orjson is not None:
+        blob = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        blob = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    # tmp + rename: a crash mid-write must not truncate the live archive
+    tmp = projects_file.with_suffix(".tmp")
+    tmp.write_bytes(blob)
+    tmp.replace(projects_file)
     
     # Final report
     print("\n✓ REGENERATION COMPLETE!")
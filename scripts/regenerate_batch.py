@@ -1,33 +1,115 @@
 #!/usr/bin/env python3
 """Regenerate content in small batches"""
 
+import concurrent.futures
+import functools
+import hashlib
 import json
+import os
 import re
 import sys
-import time
+import threading
 from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
 from tenacity import retry, wait_exponential, stop_after_attempt
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Setup paths
 ROOT = Path(__file__).parent.parent
 DOCS = ROOT / "docs/data"
 SECRETS = ROOT / "secrets"
 
-# German place name mappings
+# Bounded concurrency for Groq calls, same knob pipeline.py uses. The workers
+# replace the old 0.5s inter-item sleep; tenacity's backoff absorbs any 429.
+GROQ_CONCURRENCY = max(1, int(os.getenv("GROQ_CONCURRENCY", "4")))
+
+# One pooled session for the whole batch: keep-alive reuses the TLS tunnel to
+# api.groq.com instead of paying a fresh handshake per item
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=4,
+                                      pool_maxsize=GROQ_CONCURRENCY * 2,
+                                      max_retries=0))
+SESSION.headers.update({
+    "Content-Type": "application/json",
+    "User-Agent": "Mozilla/5.0"
+})
+
+# On-disk memo of successful generations, so re-running after a crash or a
+# partial batch never repeats completed LLM work. Lives under data/ but is
+# git-ignored: scratch state for manual runs, unlike the feed cache that
+# scrape.yml commits on purpose.
+CACHE_PATH = ROOT / "data" / "regen_cache_batch.json"
+try:
+    CACHE = json.loads(CACHE_PATH.read_text(encoding="utf-8"))
+except Exception:
+    CACHE = {}
+# Guards CACHE between the worker threads that insert and the consuming
+# thread that serializes it mid-run; dict iteration during a concurrent
+# insert is not something to leave to GIL luck
+_CACHE_LOCK = threading.Lock()
+
+def _cache_key(item):
+    # Keyed by the item's stable content hash, which survives the rewrite of
+    # title/description. Keying on the mutable text would miss for every
+    # already-checkpointed item after a crash and send its regenerated
+    # question back through the LLM on the re-run.
+    key = item.get("hash")
+    if key:
+        return key
+    src = item.get("title", "") + item.get("description", "")
+    return hashlib.sha1(src.encode("utf-8", "ignore")).hexdigest()
+
+def save_cache():
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with _CACHE_LOCK:
+        blob = json.dumps(CACHE, ensure_ascii=False, separators=(',', ':'))
+    tmp = CACHE_PATH.with_suffix(".tmp")
+    tmp.write_text(blob, encoding="utf-8")
+    tmp.replace(CACHE_PATH)
+
+def checkpoint(data, path):
+    """Atomic full-file write, called periodically so a crash mid-sweep loses
+    at most one checkpoint interval of completed API work"""
+    if orjson is not None:
+        blob = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        blob = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_bytes(blob)
+    os.replace(tmp, path)
+
+# German place name mappings, fused into one alternation with named groups so
+# a single scan replaces four sequential re.sub passes (same shape as
+# pipeline.py's _GERMAN_ALT)
 GERMAN_MAP = {
     r"\bLeśnica\b|\bLesnica\b": "Leschnitz",
     r"\bStrzelce Opolskie\b": "Gross Strehlitz",
-    r"\bOpole\b|\bOpolu\b|\bOpolski(e|m|a)?\b": "Oppeln",
+    r"\bOpole\b|\bOpolu\b|\bOpolski(?:e|m|a)?\b": "Oppeln",
     r"\bGórny Śląsk\b": "Oberschlesien"
 }
+_GERMAN_ALT = re.compile(
+    "|".join(f"(?P<g{i}>{p})" for i, p in enumerate(GERMAN_MAP)), re.IGNORECASE)
+_GERMAN_REPLS = list(GERMAN_MAP.values())
+
+def _german_repl(m):
+    return _GERMAN_REPLS[int(m.lastgroup[1:])]
+
+# Cheap membership pre-check: most descriptions mention no Polish place name at
+# all, and five C-level substring scans are far cheaper than a regex pass.
+# False positives just fall through to the regex.
+_NEEDLES = ("leśn", "lesn", "strzelce", "opol", "górny")
 
 def normalize_german_places(text):
     """Normalize place names to German"""
     out = text or ""
-    for pat, repl in GERMAN_MAP.items():
-        out = re.sub(pat, repl, out, flags=re.IGNORECASE)
-    return out
+    low = out.lower()
+    if not any(n in low for n in _NEEDLES):
+        return out
+    return _GERMAN_ALT.sub(_german_repl, out)
 
 def smart_truncate_title(text, min_len=45, max_len=58):
     """Truncate title at word boundary"""
@@ -36,67 +118,103 @@ def smart_truncate_title(text, min_len=45, max_len=58):
     text = text.rstrip('?')
     if len(text) <= max_len:
         return text + '?'
-    truncated = text[:max_len]
-    last_space = truncated.rfind(' ')
-    if last_space > min_len:
-        return truncated[:last_space].rstrip() + '?'
+    # rpartition finds the cut point in one right-to-left scan instead of
+    # slice + rfind + slice
+    head, sep, _ = text[:max_len].rpartition(' ')
+    if sep and len(head) > min_len:
+        return head.rstrip() + '?'
     return text[:min_len].rstrip() + '?'
 
 @retry(wait=wait_exponential(multiplier=1, max=10), stop=stop_after_attempt(3))
-def groq_chat(messages, api_key):
+def groq_chat(messages, api_key, max_tokens=600):
     """Call Groq API"""
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-        "User-Agent": "Mozilla/5.0"
-    }
-    
     payload = {
         "model": "openai/gpt-oss-120b",
         "messages": messages,
         "temperature": 0.7,
-        "max_tokens": 600
+        "max_tokens": max_tokens
     }
-    
-    response = requests.post(
+
+    response = SESSION.post(
         "https://api.groq.com/openai/v1/chat/completions",
-        headers=headers,
+        headers={"Authorization": f"Bearer {api_key}"},
         json=payload,
-        timeout=10
+        # 10s cut off slow generations and burned retries even at a single
+        # item's budget; batched requests decode several items' worth of
+        # tokens (plus gpt-oss reasoning) before the first byte arrives
+        timeout=60
     )
     response.raise_for_status()
     return response.json()
 
+# Compiled once; the old code re-built three patterns on every call
+_FENCE_RE = re.compile(r'```(?:json)?\s*(.*?)\s*```', re.DOTALL)
+
+def _first_json_object(text):
+    """First balanced {...} substring via one linear brace-depth scan"""
+    depth, start, in_str, escaped = 0, -1, False, False
+    for i, ch in enumerate(text):
+        if in_str:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_str = False
+        elif ch == '"':
+            in_str = True
+        elif ch == "{":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif ch == "}" and depth > 0:
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
 def extract_json(text):
     """Extract JSON from response"""
-    import re
-    patterns = [r'```json\s*(.*?)\s*```', r'```\s*(.*?)\s*```', r'\{[^{}]*\}']
-    for pattern in patterns:
-        match = re.search(pattern, text, re.DOTALL)
-        if match:
-            try:
-                return json.loads(match.group(1) if '```' in pattern else match.group(0))
-            except: pass
+    # Most replies are the bare object - parse directly before any regex work
     try:
-        return json.loads(text)
-    except:
-        return {}
+        js = json.loads(text)
+        if isinstance(js, dict):
+            return js
+    except ValueError:
+        pass
 
-def regenerate_item(item, api_key):
-    """Regenerate a single item"""
-    # Read the new system prompt
+    match = _FENCE_RE.search(text)
+    if match:
+        text = match.group(1)
+    blob = _first_json_object(text)
+    if blob:
+        try:
+            return json.loads(blob)
+        except Exception:
+            pass
+    return {}
+
+@functools.lru_cache(maxsize=1)
+def _sys_prompt():
+    """Read and assemble the system prompt once, not once per item"""
     prompt_file = SECRETS / "SYSTEM_PROMPT.local.txt"
     if not prompt_file.exists():
         raise RuntimeError("System prompt not found")
-    base_prompt = prompt_file.read_text(encoding="utf-8")
-    
-    sys_prompt = base_prompt + """
+    return prompt_file.read_text(encoding="utf-8") + """
 Create critical questions and artistic micro actions.
 Title: Question 45-58 chars exposing hidden goals
 Description: Atmospheric action with sensual details (max 500 chars)
 Never use "DATAsculptor". Use: Settler/Invader/Occupier instead of colonial.
 Return JSON with "title" and "description"."""
-    
+
+def regenerate_item(item, api_key):
+    """Regenerate a single item"""
+    key = _cache_key(item)
+    if key in CACHE:
+        return CACHE[key]
+
+    sys_prompt = _sys_prompt()
+
     user_prompt = f"""Transform to critical question and atmospheric action:
 Original: {item.get('title', '')}
 Description: {item.get('description', '')[:200]}...
@@ -111,20 +229,81 @@ JSON with "title" and "description"."""
         
         js = extract_json(result["choices"][0]["message"]["content"])
         if "title" in js and "description" in js:
-            return {
+            out = {
                 "title": smart_truncate_title(normalize_german_places(js["title"])),
                 "description": normalize_german_places(js["description"])[:500]
             }
+            with _CACHE_LOCK:
+                CACHE[key] = out  # only real generations are memoized, never the fallback
+            return out
     except Exception as e:
         print(f"  API error: {e}")
     
-    # Fallback: clean existing
-    desc = re.sub(r"DATAsculptor\s*", "", item.get("description", ""))
+    # Fallback: clean existing. Literal substring removal - str.replace skips
+    # the regex engine entirely
+    desc = item.get("description", "").replace("DATAsculptor ", "").replace("DATAsculptor", "")
     return {
         "title": smart_truncate_title(normalize_german_places(item.get("title", ""))),
         "description": normalize_german_places(desc)[:500]
     }
 
+# Items packed per Groq request; amortizes the round trip and per-request
+# token overhead across several items
+REGEN_BATCH_SIZE = max(1, int(os.getenv("REGEN_BATCH_SIZE", "5")))
+
+def regenerate_items(items, api_key):
+    """Regenerate several items with one Groq call, in input order.
+
+    Cached items are served without touching the API; any malformed or
+    incomplete reply drops the whole group back to per-item regenerate_item,
+    which carries the retry and fallback behavior.
+    """
+    results = [CACHE.get(_cache_key(it)) for it in items]
+    miss = [j for j, r in enumerate(results) if r is None]
+    if not miss:
+        return results
+
+    payload = [{"id": j,
+                "title": items[j].get("title", ""),
+                "description": (items[j].get("description") or "")[:200]}
+               for j in miss]
+    user_prompt = (
+        "Transform EACH item below to a critical question and atmospheric action.\n"
+        "For every item create a question revealing hidden agenda (45-58 chars) "
+        "and a sensual micro action (max 500 chars).\n"
+        'Return ONLY JSON: {"results": [{"id": <id>, "title": "...", "description": "..."}]} '
+        "with one entry per input id.\n"
+        "Items:\n" + json.dumps(payload, ensure_ascii=False))
+
+    try:
+        result = groq_chat([
+            {"role": "system", "content": _sys_prompt()},
+            {"role": "user", "content": user_prompt}
+        ], api_key, max_tokens=600 * len(miss))
+        js = extract_json(result["choices"][0]["message"]["content"])
+        rows = js.get("results")
+        if isinstance(rows, list):
+            by_id = {r.get("id"): r for r in rows if isinstance(r, dict)}
+            if all(j in by_id and by_id[j].get("title") and by_id[j].get("description")
+                   for j in miss):
+                for j in miss:
+                    r = by_id[j]
+                    out = {
+                        "title": smart_truncate_title(normalize_german_places(r["title"])),
+                        "description": normalize_german_places(r["description"])[:500]
+                    }
+                    with _CACHE_LOCK:
+                        CACHE[_cache_key(items[j])] = out
+                    results[j] = out
+                return results
+        print(f"  Batched reply incomplete; retrying {len(miss)} items individually")
+    except Exception as e:
+        print(f"  Batched API error ({e}); retrying {len(miss)} items individually")
+
+    for j in miss:
+        results[j] = regenerate_item(items[j], api_key)
+    return results
+
 def main():
     # Get API key from command line
     if len(sys.argv) < 2:
@@ -137,26 +316,43 @@ def main():
     
     # Load data
     projects_file = DOCS / "projects.json"
-    data = json.loads(projects_file.read_text(encoding="utf-8"))
+    if orjson is not None:
+        data = orjson.loads(projects_file.read_bytes())
+    else:
+        data = json.loads(projects_file.read_text(encoding="utf-8"))
     print(f"Loaded {len(data)} items")
     
     # Process batch
     end_idx = min(start_idx + count, len(data))
     print(f"Processing items {start_idx} to {end_idx}...")
     
-    for i in range(start_idx, end_idx):
-        item = data[i]
-        print(f"\n[{i+1}] {item['title'][:40]}...")
-        
-        new_content = regenerate_item(item, api_key)
-        item["title"] = new_content["title"]
-        item["description"] = new_content["description"]
-        
-        print(f"  ✓ {new_content['title']}")
-        time.sleep(0.5)  # Rate limiting
-    
+    # Items are packed REGEN_BATCH_SIZE per request and the requests overlap
+    # across workers; results are consumed in submission order to keep the
+    # output deterministic
+    indices = list(range(start_idx, end_idx))
+    groups = [indices[k:k + REGEN_BATCH_SIZE]
+              for k in range(0, len(indices), REGEN_BATCH_SIZE)]
+    n = 0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=GROQ_CONCURRENCY) as ex:
+        futures = [(g, ex.submit(regenerate_items, [data[i] for i in g], api_key))
+                   for g in groups]
+        for g, fut in futures:
+            for i, new_content in zip(g, fut.result()):
+                item = data[i]
+                print(f"\n[{i+1}] {item['title'][:40]}...")
+
+                item["title"] = new_content["title"]
+                item["description"] = new_content["description"]
+
+                print(f"  ✓ {new_content['title']}")
+                n += 1
+                if n % 25 == 0:
+                    checkpoint(data, projects_file)
+                    save_cache()
+
     # Save
-    projects_file.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    save_cache()
+    checkpoint(data, projects_file)
     print(f"\nSaved. Next batch: python3 regenerate_batch.py API_KEY {end_idx} {count}")
     
     return 0
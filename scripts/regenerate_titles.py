@@ -1,32 +1,110 @@
 #!/usr/bin/env python3
 """Regenerate all existing titles as critical questions"""
 
+import concurrent.futures
+import hashlib
 import json
 import re
 import os
 import sys
-import time
+import threading
 from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
 from tenacity import retry, wait_exponential, stop_after_attempt
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Setup paths
 DOCS = Path(__file__).parent.parent / "docs/data"
 
-# German place name mappings
+# Bounded concurrency for Groq calls, same knob pipeline.py uses. The workers
+# replace the old 0.5s inter-item sleep; tenacity's backoff absorbs any 429.
+GROQ_CONCURRENCY = max(1, int(os.getenv("GROQ_CONCURRENCY", "4")))
+
+# One pooled session for the whole sweep: keep-alive reuses the TLS tunnel to
+# api.groq.com instead of paying a fresh handshake per item
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=4,
+                                      pool_maxsize=GROQ_CONCURRENCY * 2,
+                                      max_retries=0))
+SESSION.headers.update({
+    "Content-Type": "application/json",
+    "User-Agent": "Mozilla/5.0"
+})
+
+# On-disk memo of successful generations, so re-running after a crash or
+# partial sweep never repeats completed LLM work. Lives under data/ but is
+# git-ignored: scratch state for manual runs, unlike the feed cache that
+# scrape.yml commits on purpose.
+CACHE_PATH = Path(__file__).parent.parent / "data" / "regen_cache_titles.json"
+try:
+    CACHE = json.loads(CACHE_PATH.read_text(encoding="utf-8"))
+except Exception:
+    CACHE = {}
+# Guards CACHE between the worker threads that insert and the consuming
+# thread that serializes it mid-run; dict iteration during a concurrent
+# insert is not something to leave to GIL luck
+_CACHE_LOCK = threading.Lock()
+
+def _cache_key(item):
+    # Keyed by the item's stable content hash, which survives the title
+    # rewrite; keying on the mutable title would miss for already-checkpointed
+    # items after a crash and regenerate a question from a question.
+    key = item.get("hash")
+    if key:
+        return key
+    return hashlib.sha1(item.get("title", "").encode("utf-8", "ignore")).hexdigest()
+
+def save_cache():
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with _CACHE_LOCK:
+        blob = json.dumps(CACHE, ensure_ascii=False, separators=(',', ':'))
+    tmp = CACHE_PATH.with_suffix(".tmp")
+    tmp.write_text(blob, encoding="utf-8")
+    tmp.replace(CACHE_PATH)
+
+def checkpoint(data, path):
+    """Atomic full-file write, called periodically so a crash mid-sweep loses
+    at most one checkpoint interval of completed API work"""
+    if orjson is not None:
+        blob = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        blob = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_bytes(blob)
+    os.replace(tmp, path)
+
+# German place name mappings, fused into one alternation with named groups so
+# a single scan replaces four sequential re.sub passes (same shape as
+# pipeline.py's _GERMAN_ALT)
 GERMAN_MAP = {
     r"\bLeśnica\b|\bLesnica\b": "Leschnitz",
     r"\bStrzelce Opolskie\b": "Gross Strehlitz",
     r"\bOpole\b": "Oppeln",
     r"\bGóra Św\.? Anny\b|\bGora Sw\.? Anny\b": "Sankt Annaberg"
 }
+_GERMAN_ALT = re.compile(
+    "|".join(f"(?P<g{i}>{p})" for i, p in enumerate(GERMAN_MAP)), re.IGNORECASE)
+_GERMAN_REPLS = list(GERMAN_MAP.values())
+
+def _german_repl(m):
+    return _GERMAN_REPLS[int(m.lastgroup[1:])]
+
+# Cheap membership pre-check: most titles mention no Polish place name at all,
+# and a few C-level substring scans are far cheaper than a regex pass. False
+# positives just fall through to the regex.
+_NEEDLES = ("leśn", "lesn", "strzelce", "opole", "góra", "gora")
 
 def normalize_german_places(text):
     """Normalize place names to German"""
     out = text or ""
-    for pat, repl in GERMAN_MAP.items():
-        out = re.sub(pat, repl, out, flags=re.IGNORECASE)
-    return out
+    low = out.lower()
+    if not any(n in low for n in _NEEDLES):
+        return out
+    return _GERMAN_ALT.sub(_german_repl, out)
 
 def smart_truncate_title(text, min_len=45, max_len=58):
     """Truncate title at word boundary to avoid mid-word cuts"""
@@ -44,14 +122,14 @@ def smart_truncate_title(text, min_len=45, max_len=58):
     if len(text) <= max_len:
         return text + '?'
     
-    # Need to truncate - find last complete word before max_len
-    truncated = text[:max_len]
-    last_space = truncated.rfind(' ')
-    
+    # Need to truncate - rpartition finds the last word boundary in one
+    # right-to-left scan instead of slice + rfind + slice
+    head, sep, _ = text[:max_len].rpartition(' ')
+
     # If we can break at a word boundary after min_len
-    if last_space > min_len:
-        return truncated[:last_space].rstrip() + '?'
-    
+    if sep and len(head) > min_len:
+        return head.rstrip() + '?'
+
     # Fallback: hard cut at min_len
     return text[:min_len].rstrip() + '?'
 
@@ -66,51 +144,75 @@ def groq_chat(messages):
     if not api_key:
         raise RuntimeError("GROQ_API_KEY not found")
     
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-        "User-Agent": "Mozilla/5.0"
-    }
-    
     payload = {
         "model": "openai/gpt-oss-120b",
         "messages": messages,
         "temperature": 0.7,
         "max_tokens": 200
     }
-    
-    response = requests.post(
+
+    response = SESSION.post(
         "https://api.groq.com/openai/v1/chat/completions",
-        headers=headers,
+        headers={"Authorization": f"Bearer {api_key}"},
         json=payload,
         timeout=10
     )
     response.raise_for_status()
     return response.json()
 
+# Compiled once; the old code re-built three patterns on every call
+_FENCE_RE = re.compile(r'```(?:json)?\s*(.*?)\s*```', re.DOTALL)
+
+def _first_json_object(text):
+    """First balanced {...} substring via one linear brace-depth scan"""
+    depth, start, in_str, escaped = 0, -1, False, False
+    for i, ch in enumerate(text):
+        if in_str:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_str = False
+        elif ch == '"':
+            in_str = True
+        elif ch == "{":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif ch == "}" and depth > 0:
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
 def extract_json(text):
     """Extract JSON from response text"""
-    patterns = [
-        r'```json\s*(.*?)\s*```',
-        r'```\s*(.*?)\s*```',
-        r'\{[^{}]*\}'
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text, re.DOTALL)
-        if match:
-            try:
-                return json.loads(match.group(1) if '```' in pattern else match.group(0))
-            except:
-                pass
-    
+    # Most replies are the bare object - parse directly before any regex work
     try:
-        return json.loads(text)
-    except:
-        return {}
+        js = json.loads(text)
+        if isinstance(js, dict):
+            return js
+    except ValueError:
+        pass
+
+    match = _FENCE_RE.search(text)
+    if match:
+        text = match.group(1)
+    blob = _first_json_object(text)
+    if blob:
+        try:
+            return json.loads(blob)
+        except Exception:
+            pass
+    return {}
 
 def generate_question_title(item):
     """Generate a critical question title for an item"""
+    key = _cache_key(item)
+    if key in CACHE:
+        return CACHE[key]
+
     kws = extract_keywords(item.get("title", ""))
     
     sys_prompt = """You create critical questions revealing hidden PR goals. Grade 9 readability.
@@ -132,8 +234,10 @@ Return JSON with "title" key."""
         
         js = extract_json(result["choices"][0]["message"]["content"])
         if "title" in js:
-            title = normalize_german_places(js["title"])
-            return smart_truncate_title(title)
+            title = smart_truncate_title(normalize_german_places(js["title"]))
+            with _CACHE_LOCK:
+                CACHE[key] = title  # only real generations are memoized, never the fallback
+            return title
     except Exception as e:
         print(f"API failed for '{item.get('title', '')[:30]}...': {e}")
     
@@ -152,7 +256,10 @@ def main():
         return 1
     
     # Load data
-    data = json.loads(projects_file.read_text(encoding="utf-8"))
+    if orjson is not None:
+        data = orjson.loads(projects_file.read_bytes())
+    else:
+        data = json.loads(projects_file.read_text(encoding="utf-8"))
     print(f"Loaded {len(data)} micro actions")
     
     # Check API key
@@ -160,44 +267,48 @@ def main():
         print("ERROR: GROQ_API_KEY not set")
         return 1
     
-    # Process each item
-    updated = 0
-    failed = 0
-    
+    # Decide what needs work first, so skips never occupy a worker
+    to_do = []
     for i, item in enumerate(data):
         old_title = item.get("title", "")
-        print(f"\n[{i+1}/{len(data)}] Processing: {old_title[:50]}...")
-        
         # Skip if already a proper question with complete words
         if old_title.endswith("?") and 45 <= len(old_title) <= 58:
             # Check if last word before ? is complete (not truncated)
             words = old_title[:-1].split()
             if words and len(words[-1]) > 3:  # Likely a complete word
-                print("  Already a proper question, skipping")
                 continue
-        
-        try:
-            new_title = generate_question_title(item)
-            if new_title and new_title != old_title:
-                item["title"] = new_title
-                print(f"  ✓ New: {new_title}")
-                updated += 1
-            else:
-                print(f"  - No change")
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
-            failed += 1
-        
-        # Rate limiting
-        if i < len(data) - 1:
-            time.sleep(0.5)  # Avoid hitting rate limits
-    
+        to_do.append(i)
+    print(f"{len(to_do)} of {len(data)} titles need regeneration")
+
+    # API round-trips dominate wall time, so overlap them; results are
+    # consumed in submission order to keep the output deterministic
+    updated = 0
+    failed = 0
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=GROQ_CONCURRENCY) as ex:
+        futures = [(i, ex.submit(generate_question_title, data[i])) for i in to_do]
+        for n, (i, fut) in enumerate(futures, 1):
+            old_title = data[i].get("title", "")
+            print(f"\n[{n}/{len(to_do)}] Processing: {old_title[:50]}...")
+            try:
+                new_title = fut.result()
+                if new_title and new_title != old_title:
+                    data[i]["title"] = new_title
+                    print(f"  ✓ New: {new_title}")
+                    updated += 1
+                else:
+                    print(f"  - No change")
+            except Exception as e:
+                print(f"  ✗ Error: {e}")
+                failed += 1
+            if n % 25 == 0:
+                checkpoint(data, projects_file)
+                save_cache()
+
     # Save updated data
+    save_cache()
     print(f"\nSaving updated data...")
-    projects_file.write_text(
-        json.dumps(data, ensure_ascii=False, indent=2),
-        encoding="utf-8"
-    )
+    checkpoint(data, projects_file)
     
     print(f"\nComplete!")
     print(f"  Updated: {updated} titles")
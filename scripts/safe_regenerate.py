@@ -12,6 +12,16 @@ from pathlib import Path
 from datetime import datetime
 import hashlib
 import re
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def load_projects():
+    """Parse projects.json, via orjson when available"""
+    if orjson is not None:
+        return orjson.loads(PROJECTS_FILE.read_bytes())
+    return json.loads(PROJECTS_FILE.read_text(encoding="utf-8"))
 
 # Paths
 DOCS = Path("docs/data")
@@ -46,20 +56,30 @@ def has_datasculptor(item):
     desc = item.get("description", "").lower()
     return "datasculptor" in title or "datasculptor" in desc
 
+def classify_item(item):
+    """One pass over an item's text: (encoding issues?, DATAsculptor mention?)
+
+    Folds what used to be two has_encoding_issues calls plus a separate
+    has_datasculptor lowering into a single walk with one .lower() per item.
+    """
+    title = item.get("title") or ""
+    desc = item.get("description") or ""
+    enc = has_encoding_issues(title) or has_encoding_issues(desc)
+    dsc = "datasculptor" in (title + "\n" + desc).lower()
+    return enc, dsc
+
 def needs_regeneration(item, criteria):
     """Check if item needs regeneration based on criteria"""
     if criteria == "all":
         return True
-    elif criteria == "encoding":
-        return (has_encoding_issues(item.get("title", "")) or 
-                has_encoding_issues(item.get("description", "")))
+    if criteria not in ("encoding", "datasculptor", "problems"):
+        return False
+    enc, dsc = classify_item(item)
+    if criteria == "encoding":
+        return enc
     elif criteria == "datasculptor":
-        return has_datasculptor(item)
-    elif criteria == "problems":
-        return (has_encoding_issues(item.get("title", "")) or 
-                has_encoding_issues(item.get("description", "")) or
-                has_datasculptor(item))
-    return False
+        return dsc
+    return enc or dsc
 
 def analyze_data():
     """Analyze current data for issues"""
@@ -67,7 +87,7 @@ def analyze_data():
         print("ERROR: projects.json not found")
         return
     
-    data = json.loads(PROJECTS_FILE.read_text(encoding="utf-8"))
+    data = load_projects()
     print(f"\n📊 Data Analysis ({len(data)} total items)")
     print("=" * 50)
     
@@ -77,9 +97,10 @@ def analyze_data():
     has_last_edited = 0
     
     for item in data:
-        if has_encoding_issues(item.get("title", "")) or has_encoding_issues(item.get("description", "")):
+        enc, dsc = classify_item(item)
+        if enc:
             encoding_issues += 1
-        if has_datasculptor(item):
+        if dsc:
             datasculptor_refs += 1
         if item.get("media"):
             has_media += 1
@@ -122,7 +143,7 @@ def selective_regenerate(criteria="problems", test_mode=False, max_items=None):
         print("ERROR: projects.json not found")
         return
     
-    data = json.loads(PROJECTS_FILE.read_text(encoding="utf-8"))
+    data = load_projects()
     
     # Find items to regenerate
     items_to_regenerate = []
@@ -181,7 +202,8 @@ def selective_regenerate(criteria="problems", test_mode=False, max_items=None):
         "backup": str(backup_file),
         "timestamp": datetime.now().isoformat()
     }
-    regen_list.write_text(json.dumps(regen_data, indent=2))
+    # machine-consumed handoff file, so compact beats pretty
+    regen_list.write_text(json.dumps(regen_data, separators=(',', ':')))
     print(f"\n✓ Saved regeneration list to {regen_list}")
     print("Run 'python scripts/pipeline.py --regenerate-selective' to execute")
 
@@ -48,7 +48,7 @@ def _install_stubs():
     try:
         import bs4  # noqa: F401
     except ImportError:
-        stub("bs4", BeautifulSoup=object)
+        stub("bs4", BeautifulSoup=object, SoupStrainer=lambda *a, **k: None)
     try:
         import dateutil.parser  # noqa: F401
     except ImportError:
@@ -63,6 +63,7 @@ def _install_stubs():
         import tenacity  # noqa: F401
     except ImportError:
         stub("tenacity", retry=lambda **kw: (lambda f: f),
+             retry_if_exception=lambda pred: None,
              wait_exponential=lambda **kw: None, stop_after_attempt=lambda n: None)
 
 